@@ -65,6 +65,10 @@ class AppContext:
 # ------------------ Seed demo (opcional) ------------------
 
 def _seed(repo_est, repo_areas, repo_permisos, repo_rfid, repo_pins, repo_pat) -> None:
+    today = date.today()
+    next_year = today.replace(year=today.year + 1)
+    prev_year = today.replace(year=today.year - 1)
+
     e = Estudiante(
         cedula_propietario="1710034065",
         nombres="Juan Esteban",
@@ -90,16 +94,16 @@ def _seed(repo_est, repo_areas, repo_permisos, repo_rfid, repo_pins, repo_pat) -
         cedula_propietario=e.cedula_propietario,
         id_area=a.id_area,
         estado=EstadoPermiso.ACTIVO,
-        vigente_desde=date.today(),
-        vigente_hasta=date.today().replace(year=date.today().year + 1),
+        vigente_desde=today,
+        vigente_hasta=next_year,
     )
     repo_permisos.guardar(p)
 
     r = CredencialRFID(
         serial="RFID-12345",
         cedula_propietario=e.cedula_propietario,
-        fecha_emision=date.today().replace(year=date.today().year - 1),
-        fecha_expiracion=date.today().replace(year=date.today().year + 1),
+        fecha_emision=prev_year,
+        fecha_expiracion=next_year,
         estado=EstadoCredencial.ACTIVA,
     )
     repo_rfid.guardar(r)
@@ -461,11 +465,7 @@ def accion_configurar_pin(ctx: AppContext) -> None:
     id_area = pedir_no_vacio("ID Área")
 
     # Garantía: 1 PIN por (cedula, area)
-    existente = None
-    for pin in ctx.repo_pins.listar():
-        if pin.cedula_propietario == cedula and pin.id_area == id_area:
-            existente = pin
-            break
+    existente = ctx.repo_pins.buscar_por_usuario_area(cedula, id_area)
 
     if existente:
         print(f"[AVISO] Ya existe un PIN para este estudiante en esta área (ID = {existente.id_pin}).")
@@ -487,11 +487,7 @@ def accion_configurar_pin(ctx: AppContext) -> None:
         return
 
     # Aviso (no bloqueante): si no hay permiso ACTIVO vigente, el acceso igual será denegado por autorización.
-    hoy = date.today()
-    permiso_ok = any(
-        (perm.cedula_propietario == cedula and perm.id_area == id_area and perm.estado.name == "ACTIVO" and perm.es_vigente(hoy))
-        for perm in ctx.repo_permisos.listar()
-    )
+    permiso_ok = ctx.repo_permisos.buscar_permiso(cedula, id_area, date.today()) is not None
     if not permiso_ok:
         print("[AVISO] No se encontró un permiso ACTIVO y vigente para este estudiante en el área.\n")
 
@@ -528,11 +524,7 @@ def accion_enrolar_patron(ctx: AppContext) -> None:
     id_banner = pedir_validado("ID Banner", validar_id_banner)
 
     # Garantía: 1 patrón por estudiante
-    existente = None
-    for pat in ctx.repo_patrones.listar():
-        if pat.cedula_propietario == cedula:
-            existente = pat
-            break
+    existente = ctx.repo_patrones.buscar_por_usuario(cedula)
 
     if existente:
         print(f"[AVISO] Ya existe un patrón para esta cédula (ID={existente.id_patron}).")
@@ -612,7 +604,7 @@ def accion_ver_registros(ctx: AppContext) -> None:
     for r in regs:
         print(
             f"[{r.timestamp:%Y-%m-%d %H:%M:%S}] Usuario > {r.cedula_propietario} Área > {r.id_area} "
-            f"Resultado > {r.resultado} Factores > {','.join([f.value for f in r.factores])} Motivo > {r.motivo}"
+            f"Resultado > {r.resultado.value} Factores > {','.join([f.value for f in r.factores])} Motivo > {r.motivo}"
         )
 
 # Datos Demo
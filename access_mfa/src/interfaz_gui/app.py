@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import heapq
+import os
+import queue
 import threading
 import tkinter as tk
+from operator import attrgetter
 from tkinter import ttk, messagebox
 
 from datetime import date, datetime, time
@@ -9,12 +13,19 @@ from datetime import date, datetime, time
 from negocio.enums import EstadoCredencial, EstadoPermiso, TipoArea
 from negocio.exceptions import DominioError, AutenticacionError, AutorizacionError
 from negocio.modelos import AreaAcceso, CredencialRFID, Estudiante, PermisoAcceso, PinGestual, PatronGestual
-from negocio.validadores import validar_cedula, validar_correo, validar_id_banner, validar_nombre
+from negocio.validadores import validar_cedula, validar_cedula_cached, validar_correo, validar_id_banner, validar_nombre
 
 from interfaz_gui.bootstrap import AppBoot, crear_app
 
 # --------------------- Utilidades UI ---------------------
 
+# Máximo de líneas que conserva un log de la GUI (ventana deslizante)
+_LOG_MAX_LINES = max(1, int(os.getenv("GUI_LOG_MAX_LINES", "1000")))
+
+# Formato de fecha/hora en la tabla de auditoría
+_TS_FMT = "%Y-%m-%d %H:%M:%S"
+
+
 def _set_readonly_text(widget: tk.Text, value: str) -> None:
     widget.config(state="normal")
     widget.delete("1.0", "end")
@@ -22,6 +33,17 @@ def _set_readonly_text(widget: tk.Text, value: str) -> None:
     widget.config(state="disabled")
 
 
+def _append_log_line(widget: tk.Text, msg: str) -> None:
+    """Agrega una línea al log y recorta las más antiguas si supera _LOG_MAX_LINES."""
+    widget.config(state="normal")
+    widget.insert("end", msg + "\n")
+    count = int(widget.index("end-1c").split(".")[0])
+    if count > _LOG_MAX_LINES:
+        widget.delete("1.0", f"{count - _LOG_MAX_LINES}.0")
+    widget.see("end")
+    widget.config(state="disabled")
+
+
 def _parse_hhmm(s: str) -> time:
     s = (s or "").strip()
     parts = s.split(":")
@@ -138,6 +160,15 @@ class ConfigDialog(tk.Toplevel):
 # --------------------- App principal ---------------------
 
 class AccessMFAWindow(tk.Tk):
+    # Columnas de la tabla de auditoría: id, encabezado y ancho
+    _COLS = ("timestamp", "cedula", "area", "metodo", "resultado", "motivo")
+    _HEADS = ("Fecha/Hora", "Cédula", "Área", "Método", "Resultado", "Motivo")
+    _WIDTHS = (120, 120, 120, 120, 120, 160)
+    # Filas insertadas por página; el resto queda tras la fila "Cargar más…"
+    _AUDIT_PAGE = 50
+    _MORE_IID = "__more__"
+    _POLL_MS = 100  # intervalo de recogida de resultados del worker de acceso
+
     def __init__(self, app: AppBoot):
         super().__init__()
         self.app = app
@@ -145,6 +176,17 @@ class AccessMFAWindow(tk.Tk):
         self.geometry("1120x680")
         self.minsize(980, 620)
 
+        # Filas de auditoría ya formateadas; None = hay que reconstruirlas
+        self._audit_cache: list[tuple] | None = None
+        self._audit_shown = 0
+
+        # Un único worker daemon para el flujo de acceso (fuera del hilo de Tk). Nunca toca Tk:
+        # deja (resultado, error) en _access_results y el hilo de Tk lo recoge con un poll vía after
+        self._access_jobs: queue.Queue[tuple[str, str, str] | None] = queue.Queue()
+        self._access_results: queue.Queue[tuple[object, Exception | None]] = queue.Queue()
+        threading.Thread(target=self._access_worker, daemon=True).start()
+        self._poll_id = self.after(self._POLL_MS, self._poll_access_results)
+
         self._build_style()
         self._build_layout()
 
@@ -269,14 +311,14 @@ class AccessMFAWindow(tk.Tk):
     def _refresh_counts(self) -> None:
         try:
             t = (
-                f"Estudiantes: {len(self.app.repo_est.listar())}    |    "
-                f"Áreas: {len(self.app.repo_areas.listar())}    |    "
-                f"Permisos: {len(self.app.repo_permisos.listar())}    |    "
-                f"RFID: {len(self.app.repo_rfid.listar())}\n"
-                f"PINs: {len(self.app.repo_pins.listar())}    |    "
-                f"Patrones: {len(self.app.repo_patrones.listar())}    |    "
-                f"Registros: {len(self.app.repo_registros.listar())}    |    "
-                f"Accesos: {len(self.app.repo_accesos.listar())}"
+                f"Estudiantes: {self.app.repo_est.contar()}    |    "
+                f"Áreas: {self.app.repo_areas.contar()}    |    "
+                f"Permisos: {self.app.repo_permisos.contar()}    |    "
+                f"RFID: {self.app.repo_rfid.contar()}\n"
+                f"PINs: {self.app.repo_pins.contar()}    |    "
+                f"Patrones: {self.app.repo_patrones.contar()}    |    "
+                f"Registros: {self.app.repo_registros.contar()}    |    "
+                f"Accesos: {self.app.repo_accesos.contar()}"
             )
             self.lbl_counts.config(text=t)
         except Exception:
@@ -373,7 +415,7 @@ class AccessMFAWindow(tk.Tk):
         txt.config(state="disabled")
 
         def refresh():
-            items = self.app.repo_est.listar()
+            items = self.app.repo_est.iterar()
             out = "\n".join([f"- {e.cedula_propietario} | {e.nombres} {e.apellidos} | {e.id_banner} | {e.carrera}" for e in items]) or "(vacío)"
             _set_readonly_text(txt, out)
 
@@ -435,7 +477,7 @@ class AccessMFAWindow(tk.Tk):
         txt = tk.Text(right, height=18, wrap="word"); txt.pack(fill="both", expand=True); txt.config(state="disabled")
 
         def refresh():
-            items = self.app.repo_areas.listar()
+            items = self.app.repo_areas.iterar()
             out = "\n".join([f"- {a.id_area} | {a.nombre} | {a.tipo.name} | {a.ubicacion} | {a.hora_apertura}-{a.hora_cierre}" for a in items]) or "(vacío)"
             _set_readonly_text(txt, out)
 
@@ -497,7 +539,7 @@ class AccessMFAWindow(tk.Tk):
         txt = tk.Text(right, height=18, wrap="word"); txt.pack(fill="both", expand=True); txt.config(state="disabled")
 
         def refresh():
-            items = self.app.repo_permisos.listar()
+            items = self.app.repo_permisos.iterar()
             out = "\n".join([f"- {p.id_permiso} | {p.cedula_propietario} | {p.id_area} | {p.estado.name} | {p.vigente_desde} -> {p.vigente_hasta}" for p in items]) or "(vacío)"
             _set_readonly_text(txt, out)
 
@@ -556,7 +598,7 @@ class AccessMFAWindow(tk.Tk):
         txt = tk.Text(right, height=18, wrap="word"); txt.pack(fill="both", expand=True); txt.config(state="disabled")
 
         def refresh():
-            items = self.app.repo_rfid.listar()
+            items = self.app.repo_rfid.iterar()
             out = "\n".join([f"- {r.serial} | {r.cedula_propietario} | {r.estado.name} | {r.fecha_emision} -> {r.fecha_expiracion}" for r in items]) or "(vacío)"
             _set_readonly_text(txt, out)
 
@@ -592,10 +634,7 @@ class AccessMFAWindow(tk.Tk):
         log.config(state="disabled")
 
         def write(msg: str) -> None:
-            log.config(state="normal")
-            log.insert("end", msg + "\n")
-            log.see("end")
-            log.config(state="disabled")
+            _append_log_line(log, msg)
 
         def do_capture_and_save():
             try:
@@ -667,10 +706,7 @@ class AccessMFAWindow(tk.Tk):
         log = tk.Text(tab, height=12, wrap="word"); log.pack(fill="both", expand=True, pady=(10, 0)); log.config(state="disabled")
 
         def write(msg: str) -> None:
-            log.config(state="normal")
-            log.insert("end", msg + "\n")
-            log.see("end")
-            log.config(state="disabled")
+            _append_log_line(log, msg)
 
         def do_capture_and_save():
             try:
@@ -719,60 +755,93 @@ class AccessMFAWindow(tk.Tk):
 
         ttk.Label(card, text="Intentar acceso", style="Card.TLabel", font=("Segoe UI", 12, "bold")).pack(anchor="w")
 
-        v_ced = tk.StringVar()
-        v_area = tk.StringVar()
-        v_serial = tk.StringVar(value="RFID-")
-
-        def row(lbl, var):
+        def row(lbl) -> ttk.Entry:
             r = ttk.Frame(card); r.pack(fill="x", pady=4)
             ttk.Label(r, text=lbl, width=18, style="Card.TLabel").pack(side="left")
-            e = ttk.Entry(r, textvariable=var)
+            e = ttk.Entry(r)
             e.pack(side="left", fill="x", expand=True)
+            return e
 
-        row("Cédula:", v_ced)
-        row("ID Área:", v_area)
-        row("Serial RFID:", v_serial)
+        # Lectura directa desde los Entry (sin StringVar intermedio)
+        self.ent_ced = row("Cédula:")
+        self.ent_area = row("ID Área:")
+        self.ent_serial = row("Serial RFID:")
+        self.ent_serial.insert(0, "RFID-")
 
-        out = tk.Text(frm, height=18, wrap="word")
-        out.pack(fill="both", expand=True, pady=12)
-        out.config(state="disabled")
+        self.txt_acceso = tk.Text(frm, height=18, wrap="word")
+        self.txt_acceso.pack(fill="both", expand=True, pady=12)
+        self.txt_acceso.config(state="disabled")
 
-        def write(msg: str) -> None:
-            out.config(state="normal")
-            out.insert("end", msg + "\n")
-            out.see("end")
-            out.config(state="disabled")
-
-        def do_access():
+        def on_access():
             try:
-                ced = validar_cedula(v_ced.get())
-                id_area = (v_area.get() or "").strip()
-                serial = (v_serial.get() or "").strip()
-
-                write("Iniciando flujo 2FA: se abrirá la ventana de la cámara/simulador cuando corresponda.")
-                acceso, registro = self.app.caso_uso.solicitar_acceso(
-                    cedula_propietario=ced,
-                    id_area=id_area,
-                    serial_rfid=serial,
-                    sensor=self.app.sensor,
-                    actuador=self.app.actuador,
-                    gesto_cierre=19,
-                )
-                rid = getattr(registro, "id_registro", "-")
-                write(f"[EXITO] Acceso={acceso.id_acceso} | Registro={rid}")
-                self._refresh_counts()
-                self._refresh_auditoria()
-            except (AutorizacionError, AutenticacionError) as ex:
-                write(f"[DENEGADO] {ex}")
-                self._refresh_auditoria()
+                ced = validar_cedula_cached(self.ent_ced.get())
             except DominioError as ex:
-                write(f"[DENEGADO] {ex}")
-            except Exception as ex:
-                write(f"[ERROR] {type(ex).__name__}: {ex}")
+                _append_log_line(self.txt_acceso, f"[DENEGADO] {ex}")
+                return
+            id_area = self.ent_area.get().strip()
+            serial = self.ent_serial.get().strip()
+
+            _append_log_line(self.txt_acceso, "Iniciando flujo 2FA: se abrirá la ventana de la cámara/simulador cuando corresponda.")
+            self._access_jobs.put((ced, id_area, serial))
 
-        ttk.Button(card, text="Solicitar Acceso", command=lambda: threading.Thread(target=do_access, daemon=True).start()).pack(anchor="e", pady=(10, 0))
+        ttk.Button(card, text="Solicitar Acceso", command=on_access).pack(anchor="e", pady=(10, 0))
         return frm
 
+    def _run_access(self, ced: str, id_area: str, serial: str):
+        """Corre en el worker: solo lógica de negocio, sin tocar widgets."""
+        return self.app.caso_uso.solicitar_acceso(
+            cedula_propietario=ced,
+            id_area=id_area,
+            serial_rfid=serial,
+            sensor=self.app.sensor,
+            actuador=self.app.actuador,
+            gesto_cierre=19,
+        )
+
+    def _access_worker(self) -> None:
+        """Hilo daemon: atiende los intentos en orden; None lo detiene."""
+        while (job := self._access_jobs.get()) is not None:
+            try:
+                self._access_results.put((self._run_access(*job), None))
+            except Exception as ex:
+                self._access_results.put((None, ex))
+
+    def _poll_access_results(self) -> None:
+        """Corre en el hilo de Tk: procesa los resultados listos y se vuelve a agendar."""
+        while True:
+            try:
+                resultado, error = self._access_results.get_nowait()
+            except queue.Empty:
+                break
+            self._on_access_done(resultado, error)
+        self._poll_id = self.after(self._POLL_MS, self._poll_access_results)
+
+    def _on_access_done(self, resultado, error: Exception | None) -> None:
+        """Corre en el hilo de Tk: muestra el resultado y refresca la auditoría."""
+        def write(msg: str) -> None:
+            _append_log_line(self.txt_acceso, msg)
+
+        try:
+            if error is not None:
+                raise error
+            acceso, registro = resultado
+            rid = getattr(registro, "id_registro", "-")
+            write(f"[EXITO] Acceso={acceso.id_acceso} | Registro={rid}")
+            self._mark_audit_dirty()
+            self._refresh_counts()
+            self._refresh_auditoria()
+        except (AutorizacionError, AutenticacionError) as ex:
+            write(f"[DENEGADO] {ex}")
+            self._mark_audit_dirty()
+            self._refresh_auditoria()
+        except DominioError as ex:
+            # Los fallos de hardware también quedan auditados
+            write(f"[DENEGADO] {ex}")
+            self._mark_audit_dirty()
+            self._refresh_auditoria()
+        except Exception as ex:
+            write(f"[ERROR] {type(ex).__name__}: {ex}")
+
     # --------------------- Auditoría ---------------------
 
     def _build_auditoria(self, parent: ttk.Frame) -> ttk.Frame:
@@ -781,55 +850,79 @@ class AccessMFAWindow(tk.Tk):
         top = ttk.Frame(frm)
         top.pack(fill="x", pady=(0, 10))
         ttk.Label(top, text="Registros de autenticación", style="H2.TLabel").pack(side="left")
-        ttk.Button(top, text="Actualizar", command=self._refresh_auditoria).pack(side="right")
+        ttk.Button(top, text="Actualizar", command=self._reload_auditoria).pack(side="right")
 
-        cols = ("timestamp", "cedula", "area", "metodo", "resultado", "motivo")
-        self.tree = ttk.Treeview(frm, columns=cols, show="headings", height=18)
+        self.tree = ttk.Treeview(frm, columns=self._COLS, show="headings", height=18)
         self.tree.pack(fill="both", expand=True)
 
-        heads = {
-            "timestamp": "Fecha/Hora",
-            "cedula": "Cédula",
-            "area": "Área",
-            "metodo": "Método",
-            "resultado": "Resultado",
-            "motivo": "Motivo",
-        }
-        for c in cols:
-            self.tree.heading(c, text=heads[c])
-            self.tree.column(c, width=160 if c == "motivo" else 120, anchor="w")
+        for c, head, width in zip(self._COLS, self._HEADS, self._WIDTHS):
+            self.tree.heading(c, text=head)
+            self.tree.column(c, width=width, anchor="w")
+        self.tree.bind("<Double-1>", self._on_audit_double_click)
 
         self._refresh_auditoria()
         return frm
 
+    def _mark_audit_dirty(self) -> None:
+        """Invalida las filas cacheadas (llamar cuando se agregan registros)."""
+        self._audit_cache = None
+
+    def _reload_auditoria(self) -> None:
+        self._mark_audit_dirty()
+        self._refresh_auditoria()
+
+    def _audit_rows(self) -> list[tuple]:
+        if self._audit_cache is None:
+            # Top-200 más recientes sin ordenar todo el historial
+            regs = heapq.nlargest(200, self.app.repo_registros.iterar(), key=attrgetter("timestamp"))
+            self._audit_cache = [
+                (
+                    r.timestamp.strftime(_TS_FMT),
+                    r.cedula_propietario,
+                    r.id_area,
+                    r.metodo.name,
+                    r.resultado.name,
+                    r.motivo,
+                )
+                for r in regs
+            ]
+        return self._audit_cache
+
     def _refresh_auditoria(self) -> None:
         if not hasattr(self, "tree"):
             return
         for i in self.tree.get_children():
             self.tree.delete(i)
 
+        self._audit_shown = 0
         try:
-            regs = self.app.repo_registros.listar()
-            regs.sort(key=lambda r: r.timestamp, reverse=True)
-            for r in regs[:200]:
-                self.tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        r.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                        r.cedula_propietario,
-                        r.id_area,
-                        r.metodo.name,
-                        r.resultado.name,
-                        r.motivo,
-                    ),
-                )
+            self._audit_next_page()
         except Exception:
             pass
 
+    def _audit_next_page(self) -> None:
+        rows = self._audit_rows()
+        if self.tree.exists(self._MORE_IID):
+            self.tree.delete(self._MORE_IID)
+
+        end = self._audit_shown + self._AUDIT_PAGE
+        for values in rows[self._audit_shown:end]:
+            self.tree.insert("", "end", values=values)
+        self._audit_shown = min(end, len(rows))
+
+        if self._audit_shown < len(rows):
+            self.tree.insert("", "end", iid=self._MORE_IID, values=("Cargar más…", "", "", "", "", ""))
+
+    def _on_audit_double_click(self, event) -> None:
+        if self.tree.identify_row(event.y) == self._MORE_IID:
+            self._audit_next_page()
+
     # --------------------- Seed demo ---------------------
 
     def _seed_demo(self) -> None:
+        today = date.today()
+        next_year = today.replace(year=today.year + 1)
+        prev_year = today.replace(year=today.year - 1)
         try:
             e = Estudiante(
                 cedula_propietario="1710034065",
@@ -856,16 +949,16 @@ class AccessMFAWindow(tk.Tk):
                 cedula_propietario=e.cedula_propietario,
                 id_area=a.id_area,
                 estado=EstadoPermiso.ACTIVO,
-                vigente_desde=date.today(),
-                vigente_hasta=date.today().replace(year=date.today().year + 1),
+                vigente_desde=today,
+                vigente_hasta=next_year,
             )
             self.app.repo_permisos.guardar(p)
 
             r = CredencialRFID(
                 serial="RFID-12345",
                 cedula_propietario=e.cedula_propietario,
-                fecha_emision=date.today().replace(year=date.today().year - 1),
-                fecha_expiracion=date.today().replace(year=date.today().year + 1),
+                fecha_emision=prev_year,
+                fecha_expiracion=next_year,
                 estado=EstadoCredencial.ACTIVA,
             )
             self.app.repo_rfid.guardar(r)
@@ -896,6 +989,8 @@ class AccessMFAWindow(tk.Tk):
 
     def _on_close(self) -> None:
         try:
+            self.after_cancel(self._poll_id)
+            self._access_jobs.put(None)
             self.app.close()
         finally:
             self.destroy()
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Optional
 
 from negocio.exceptions import IntegracionHardwareError
 
@@ -45,6 +45,8 @@ class AppBoot:
     svc_autz: ServicioAutorizacion
     svc_audit: ServicioAuditoria
 
+    # `.close()` de sensor/actuador, resueltos una vez en crear_app
+    closers: tuple[Callable[[], None], ...] = ()
 
     # --- Aliases de compatibilidad (GUI/console) ---
 
@@ -55,13 +57,11 @@ class AppBoot:
 
     def close(self) -> None:
         """Cierra recursos externos (puerto serial, etc.) si implementan `.close()`."""
-        for obj in (self.sensor, self.actuador):
-            fn = getattr(obj, "close", None)
-            if callable(fn):
-                try:
-                    fn()
-                except Exception:
-                    pass
+        for fn in self.closers:
+            try:
+                fn()
+            except Exception as ex:
+                print(f"[AVISO] Fallo al cerrar {getattr(fn, '__qualname__', fn)}: {ex}")
 
 def crear_app(
     usar_camara: bool,
@@ -111,6 +111,8 @@ def crear_app(
 
     caso_uso = CasoUsoAcceso(svc_authz, svc_authn, svc_audit)
 
+    closers = tuple(fn for o in (sensor, actuador) if callable(fn := getattr(o, "close", None)))
+
     return AppBoot(
         repo_estudiantes=repo_estudiantes,
         repo_areas=repo_areas,
@@ -126,6 +128,7 @@ def crear_app(
         caso_uso=caso_uso,
         sensor=sensor,
         actuador=actuador,
+        closers=closers,
     )
 
 
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from operator import eq
+from typing import Sequence
+
+from .exceptions import ValidacionError
+
+# Similitud de patrones gestuales. ServicioAutenticacion.validar_patron usa similitud_patron
+# (con umbral); similitudes_batch la aplica en lote para auditorías offline, sin efectos sobre repos.
+
+
+def similitud_patron(ref: Sequence[int], capturada: Sequence[int]) -> float:
+    """Posiciones iguales / longitud mayor (si las longitudes difieren, se penaliza)."""
+    n = max(len(ref), len(capturada))
+    if n == 0:
+        return 0.0
+    # map se detiene en la secuencia más corta
+    return sum(map(eq, ref, capturada)) / n
+
+
+def similitudes_batch(refs: Sequence[Sequence[int]], capturadas: Sequence[Sequence[int]]) -> list[float]:
+    """Similitud de cada par (refs[i], capturadas[i])."""
+    if len(refs) != len(capturadas):
+        raise ValidacionError(
+            f"refs y capturadas deben tener la misma cantidad de secuencias ({len(refs)} != {len(capturadas)})."
+        )
+    return list(map(similitud_patron, refs, capturadas))
@@ -2,7 +2,7 @@ from __future__ import annotations
 import os
 
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from uuid import uuid4
 
@@ -22,6 +22,38 @@ class CasoUsoAcceso:
     servicio_autenticacion: ServicioAutenticacion
     servicio_auditoria: ServicioAuditoria
 
+    # Configuración de captura (se lee del entorno una sola vez, en __post_init__)
+    _gesto_cierre_on: bool = field(init=False, repr=False)
+    _pin_timeout_s: float = field(init=False, repr=False)
+    _patron_timeout_s: float = field(init=False, repr=False)
+    _patron_len: int = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # Desactivación de 'gesto_cierre' por defecto (evita cortes accidentales al retirar la mano).
+        # Activación explícita con AUTH_GESTO_CIERRE=1
+        self._gesto_cierre_on = os.getenv("AUTH_GESTO_CIERRE", "0") == "1"
+        self._pin_timeout_s = float(os.getenv("AUTH_PIN_TIMEOUT_S", "60"))
+        self._patron_timeout_s = float(os.getenv("AUTH_PATRON_TIMEOUT_S", "150"))
+        self._patron_len = int(os.getenv("AUTH_PATRON_LEN", "6"))
+
+    def configurar_captura(
+            self,
+            *,
+            gesto_cierre_on: bool | None = None,
+            pin_timeout_s: float | None = None,
+            patron_timeout_s: float | None = None,
+            patron_len: int | None = None,
+    ) -> None:
+        """Sobrescribe la configuración leída del entorno (útil en pruebas)."""
+        if gesto_cierre_on is not None:
+            self._gesto_cierre_on = bool(gesto_cierre_on)
+        if pin_timeout_s is not None:
+            self._pin_timeout_s = float(pin_timeout_s)
+        if patron_timeout_s is not None:
+            self._patron_timeout_s = float(patron_timeout_s)
+        if patron_len is not None:
+            self._patron_len = int(patron_len)
+
     def solicitar_acceso(
             self,
             *,
@@ -39,16 +71,19 @@ class CasoUsoAcceso:
         if ahora is None:
             ahora = datetime.now()
 
-        # Desactivación de 'gesto_cierre' por defecto (evita cortes accidentales al retirar la mano).
-        # Activación explícita con AUTH_GESTO_CIERRE=1
-        gesto_cierre_auth: int | None = None
-        if os.getenv("AUTH_GESTO_CIERRE", "0") == "1":
-            gesto_cierre_auth = gesto_cierre
-
-        pin_timeout_s = float(os.getenv("AUTH_PIN_TIMEOUT_S", "60"))
-        patron_timeout_s = float(os.getenv("AUTH_PATRON_TIMEOUT_S", "150"))
-        patron_len = int(os.getenv("AUTH_PATRON_LEN", "6"))
+        gesto_cierre_auth = gesto_cierre if self._gesto_cierre_on else None
+        pin_timeout_s = self._pin_timeout_s
+        patron_timeout_s = self._patron_timeout_s
+        patron_len = self._patron_len
 
+        # Campos comunes a todos los registros de auditoría de este intento
+        auditoria = dict(
+            cedula_propietario=cedula_propietario,
+            id_area=id_area,
+            metodo=MetodoIngreso.RFID,
+            factores=factores_ok,
+            timestamp=ahora,
+        )
 
         try:
             # 1) Autorización
@@ -83,14 +118,10 @@ class CasoUsoAcceso:
             actuador.abrir_puerta()
 
             registro = self.servicio_auditoria.registrar(
-                cedula_propietario=cedula_propietario,
-                id_area=id_area,
-                metodo=MetodoIngreso.RFID,
-                factores=factores_ok,
+                **auditoria,
                 resultado=ResultadoAutenticacion.EXITO,
                 motivo="",
                 id_permiso=permiso.id_permiso,
-                timestamp=ahora,
             )
 
             from .modelos import Acceso
@@ -106,38 +137,22 @@ class CasoUsoAcceso:
 
             return acceso, registro
 
-        except (AutenticacionError, AutorizacionError) as ex:
+        except (AutenticacionError, AutorizacionError, IntegracionHardwareError) as ex:
             try:
                 actuador.indicar_fallo()
             except Exception:
                 pass
-            self.servicio_auditoria.registrar(
-                cedula_propietario=cedula_propietario,
-                id_area=id_area,
-                metodo=MetodoIngreso.RFID,
-                factores=factores_ok,
-                resultado=ResultadoAutenticacion.FALLO,
-                motivo=str(ex),
-                id_permiso=permiso.id_permiso if permiso else None,
-                timestamp=ahora,
-            )
 
-            raise
-        except IntegracionHardwareError as ex:
-            # hardware/cámara/modelo: auditado
-            try:
-                actuador.indicar_fallo()
-            except Exception:
-                pass
+            # hardware/cámara/modelo: también auditado
+            if isinstance(ex, IntegracionHardwareError):
+                motivo = f"Fallo hardware: {ex}"
+            else:
+                motivo = str(ex)
 
             self.servicio_auditoria.registrar(
-                cedula_propietario=cedula_propietario,
-                id_area=id_area,
-                metodo=MetodoIngreso.RFID,
-                factores=factores_ok,
+                **auditoria,
                 resultado=ResultadoAutenticacion.FALLO,
-                motivo=f"Fallo hardware: {ex}",
+                motivo=motivo,
                 id_permiso=permiso.id_permiso if permiso else None,
             )
             raise
-
@@ -4,37 +4,37 @@ from enum import Enum
 
 # Enunciados
 
-class EstadoCredencial(str, Enum):
+class EstadoCredencial(Enum):
     ACTIVA = "ACTIVA"
     BLOQUEADA = "BLOQUEADA"
     EXPIRADA = "EXPIRADA"
     PERDIDA = "PERDIDA"
 
 
-class EstadoPin(str, Enum):
+class EstadoPin(Enum):
     ACTIVO = "ACTIVO"
     BLOQUEADO = "BLOQUEADO"
 
 
-class ResultadoAutenticacion(str, Enum):
+class ResultadoAutenticacion(Enum):
     EXITO = "EXITO"
     FALLO = "FALLO"
 
 
-class MetodoIngreso(str, Enum):
+class MetodoIngreso(Enum):
     CEDULA = "CEDULA"
     RFID = "RFID"
     PIN_GESTUAL = "PIN_GESTUAL"
     PATRON_GESTUAL = "PATRON_GESTUAL"
 
 
-class TipoArea(str, Enum):
+class TipoArea(Enum):
     LABORATORIO = "LABORATORIO"
     BODEGA = "BODEGA"
     AREA_SENSIBLE = "AREA SENSIBLE"
 
 
-class EstadoPermiso(str, Enum):
+class EstadoPermiso(Enum):
     ACTIVO = "ACTIVO"
     SUSPENDIDO = "SUSPENDIDO"
     EXPIRADO = "EXPIRADO"
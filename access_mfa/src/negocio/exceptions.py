@@ -10,6 +10,15 @@ class AutenticacionError(DominioError):
     """Fallo de auth (RFID/PIN/Patrón)."""
 
 
+class SimilitudPatronError(AutenticacionError):
+    """Patrón gestual bajo el umbral de similitud."""
+
+    def __init__(self, similitud: float, umbral: float) -> None:
+        super().__init__(f"Patrón gestual no coincide (similitud={similitud:.2f}, umbral={umbral:.2f}).")
+        self.similitud = similitud
+        self.umbral = umbral
+
+
 class AutorizacionError(DominioError):
     """Fallo de autorizacion (sin permiso / fuera de horario)."""
 
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import sys
+from dataclasses import MISSING, dataclass, field, fields
 from datetime import datetime, time, date
-from typing import List, Optional
+from typing import List, NoReturn, Optional
 
 from .enums import (
     EstadoCredencial,
@@ -17,19 +18,48 @@ from .validadores import validar_cedula, validar_correo, validar_id_banner, vali
 
 # Requerimiento de estado "no vacio"
 
+def _bad_empty(field_name: str) -> NoReturn:
+    raise ValidacionError(f"{field_name} no puede estar vacío.")
+
+
 def _require_non_empty(value: str, field_name: str) -> str:
-    if not isinstance(value, str) or not value.strip():
-        raise ValidacionError(f"{field_name} no puede estar vacío.")
-    return value.strip()
+    s = value.strip() if value.__class__ is str else _bad_empty(field_name)
+    if not s:
+        _bad_empty(field_name)
+    return s
+
+# Claves repetidas entre modelos/repos (cedula, id_area, id_banner): internadas,
+# asi las comparaciones y lookups de dict entre registros iguales son por identidad
+
+def _require_key(value: str, field_name: str) -> str:
+    return sys.intern(_require_non_empty(value, field_name))
 
 # Requerimiento y validacion de rangos (int)
 
 def _require_int_range(value: int, field_name: str, min_v: int, max_v: int) -> int:
-    if not isinstance(value, int) or not (min_v <= value <= max_v):
-        raise ValidacionError(f"{field_name} debe estar entre {min_v} y {max_v}.")
-    return value
+    if type(value) is int and min_v <= value <= max_v:
+        return value
+    raise ValidacionError(f"{field_name} debe estar entre {min_v} y {max_v}.")
+
+# Hora del día como entero (mismo orden que comparar datetime.time)
+
+def _us_del_dia(t: time | datetime) -> int:
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 1_000_000 + t.microsecond
+
+# Estados de credencial que la invalidan sin importar la fecha. Tupla y no frozenset:
+# `in` sobre tupla compara primero por identidad (sin pasar por Enum.__hash__ en Python)
+_RFID_ESTADOS_INVALIDOS = (EstadoCredencial.BLOQUEADA, EstadoCredencial.PERDIDA)
 
-@dataclass
+# Validacion de secuencia de gestos (0..31) en una sola pasada
+
+def _require_gestos(secuencia: List[int]) -> List[int]:
+    gestos = list(secuencia)
+    # type(...) is int: igual que _require_int_range, bool no cuenta como gesto
+    if not all(type(g) is int and 0 <= g <= 31 for g in gestos):
+        raise ValidacionError("gesto debe estar entre 0 y 31.")
+    return gestos
+
+@dataclass(slots=True)
 class Estudiante:
     cedula_propietario: str
     nombres: str
@@ -40,7 +70,7 @@ class Estudiante:
     estado: str = "ACTIVO"
 
     def __post_init__(self) -> None:
-        self.cedula_propietario = _require_non_empty(self.cedula_propietario, "Cédula")
+        self.cedula_propietario = _require_key(self.cedula_propietario, "Cédula")
         validar_cedula(self.cedula_propietario)
 
         self.nombres = _require_non_empty(self.nombres, "Nombres")
@@ -52,10 +82,10 @@ class Estudiante:
         validar_correo(self.correo_institucional)
 
         self.id_banner = _require_non_empty(self.id_banner, "ID Banner")
-        self.id_banner = validar_id_banner(self.id_banner)
+        self.id_banner = sys.intern(validar_id_banner(self.id_banner))
         self.carrera = _require_non_empty(self.carrera, "Carrera")
 
-@dataclass
+@dataclass(slots=True)
 class AreaAcceso:
     id_area: str
     nombre: str
@@ -64,23 +94,30 @@ class AreaAcceso:
     hora_apertura: time
     hora_cierre: time
 
+    # Horario precalculado en microsegundos del día (derivado de las horas, no se pasa al crear)
+    _abre_us: int = field(init=False, repr=False, compare=False)
+    _cierra_us: int = field(init=False, repr=False, compare=False)
+
     def __post_init__(self) -> None:
-        self.id_area = _require_non_empty(self.id_area, "id_area")
+        self.id_area = _require_key(self.id_area, "id_area")
         self.nombre = _require_non_empty(self.nombre, "nombre")
         self.ubicacion = _require_non_empty(self.ubicacion, "ubicación")
         if not isinstance(self.hora_apertura, time) or not isinstance(self.hora_cierre, time):
             raise ValidacionError("Hora de Apertura y Hora de Cierre deben ser tipo 'datetime.time.'")
+        self._abre_us = _us_del_dia(self.hora_apertura)
+        self._cierra_us = _us_del_dia(self.hora_cierre)
 
     def es_accesible_ahora(self, ahora: datetime) -> bool:
-        t = ahora.time()
-        if self.hora_apertura <= self.hora_cierre:
+        t = _us_del_dia(ahora)
+        a, c = self._abre_us, self._cierra_us
+        if a <= c:
             # mismo día
-            return self.hora_apertura <= t <= self.hora_cierre
+            return a <= t <= c
         # cruza medianoche (ej. 20:00 a 07:00)
-        return t >= self.hora_apertura or t <= self.hora_cierre
+        return t >= a or t <= c
 
 
-@dataclass
+@dataclass(slots=True)
 class CredencialRFID:
     serial: str
     cedula_propietario: str
@@ -93,19 +130,19 @@ class CredencialRFID:
 
     def __post_init__(self) -> None:
         self.serial = _require_non_empty(self.serial, "Serial RFID")
-        self.cedula_propietario = _require_non_empty(self.cedula_propietario, "Cédula Propietario")
+        self.cedula_propietario = _require_key(self.cedula_propietario, "Cédula Propietario")
         validar_cedula(self.cedula_propietario)
         if self.fecha_expiracion < self.fecha_emision:
             raise ValidacionError("Fecha de Expiración no puede ser anterior a Fecha de Emisión.")
 
     def esta_vigente(self, hoy: date) -> bool:
-        if self.estado in (EstadoCredencial.BLOQUEADA, EstadoCredencial.PERDIDA):
+        if self.estado in _RFID_ESTADOS_INVALIDOS:
             return False
         if hoy > self.fecha_expiracion:
             return False
         return True
 
-@dataclass
+@dataclass(slots=True)
 class PinGestual:
     id_pin: str
     cedula_propietario: str
@@ -116,26 +153,29 @@ class PinGestual:
     intentos_fallidos: int = 0
     max_intentos: int = 3
 
+    # Secuencia como bytes para la comparación en validar_pin (derivada, no se pasa al crear)
+    _secuencia_bytes: bytes = field(init=False, repr=False, compare=False)
+
     def __post_init__(self) -> None:
         self.id_pin = _require_non_empty(self.id_pin, field_name="ID Pin")
-        self.cedula_propietario = _require_non_empty(self.cedula_propietario, field_name="Cédula del Propietario")
-        self.id_banner = _require_non_empty(self.id_banner, field_name="ID Banner")
-        self.id_area = _require_non_empty(self.id_area, field_name="ID Área")
+        self.cedula_propietario = _require_key(self.cedula_propietario, field_name="Cédula del Propietario")
+        self.id_banner = _require_key(self.id_banner, field_name="ID Banner")
+        self.id_area = _require_key(self.id_area, field_name="ID Área")
 
         validar_cedula(self.cedula_propietario)
         validar_id_banner(self.id_banner)
 
         if len(self.secuencia_gestos) == 0:
             raise ValidacionError("Secuencia de Gestos NO puede estar vacía.")
-        if len(self.secuencia_gestos) != 4 or any(not isinstance(x, int) for x in self.secuencia_gestos):
+        if len(self.secuencia_gestos) != 4:
             raise ValidacionError("PIN gestual debe tener exactamente 4 enteros.")
-        self.secuencia_gestos = [
-            _require_int_range(g, "gesto", 0, 31) for g in self.secuencia_gestos
-        ]
+        # _require_gestos ya valida tipo (int) y rango en la misma pasada
+        self.secuencia_gestos = _require_gestos(self.secuencia_gestos)
+        self._secuencia_bytes = bytes(self.secuencia_gestos)
         self.max_intentos = _require_int_range(self.max_intentos, "Max intentos", 1, 10)
 
 
-@dataclass
+@dataclass(slots=True)
 class PatronGestual:
     id_patron: str
     cedula_propietario: str
@@ -144,15 +184,16 @@ class PatronGestual:
 
     tiempos_entre_gestos: Optional[List[float]] = None
 
+    # Cache de rangos de tolerancia de timing (lo llena ServicioAutenticacion; no se pasa al crear)
+    _rangos_timing: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
     def __post_init__(self) -> None:
         self.id_patron = _require_non_empty(self.id_patron, "ID Patron")
-        self.cedula_propietario = _require_non_empty(self.cedula_propietario, "cédula propietario")
+        self.cedula_propietario = _require_key(self.cedula_propietario, "cédula propietario")
         validar_cedula(self.cedula_propietario)
         if len(self.secuencia_gestos) == 0:
             raise ValidacionError("secuencia_gestos del patrón no puede estar vacía.")
-        self.secuencia_gestos = [
-            _require_int_range(g, "gesto", 0, 31) for g in self.secuencia_gestos
-        ]
+        self.secuencia_gestos = _require_gestos(self.secuencia_gestos)
         if self.tiempos_entre_gestos is not None:
             if len(self.tiempos_entre_gestos) != max(0, len(self.secuencia_gestos) - 1):
                 raise ValidacionError(
@@ -162,7 +203,7 @@ class PatronGestual:
                 raise ValidacionError("Tiempo entre Gestos no puede contener valores negativos.")
 
 
-@dataclass
+@dataclass(slots=True)
 class PermisoAcceso:
     id_permiso: str
     cedula_propietario: str
@@ -173,14 +214,14 @@ class PermisoAcceso:
 
     def __post_init__(self) -> None:
         self.id_permiso = _require_non_empty(self.id_permiso, "ID Permiso")
-        self.cedula_propietario = _require_non_empty(self.cedula_propietario, "Cédula Usuario")
+        self.cedula_propietario = _require_key(self.cedula_propietario, "Cédula Usuario")
         validar_cedula(self.cedula_propietario)
-        self.id_area = _require_non_empty(self.id_area, "ID Area")
+        self.id_area = _require_key(self.id_area, "ID Area")
         if self.vigente_desde and self.vigente_hasta and self.vigente_hasta < self.vigente_desde:
             raise ValidacionError("Vigente 'hasta' no puede ser anterior a Vigente 'desde'.")
 
     def es_vigente(self, hoy: date) -> bool:
-        if self.estado != EstadoPermiso.ACTIVO:
+        if self.estado is not EstadoPermiso.ACTIVO:
             return False
         if self.vigente_desde and hoy < self.vigente_desde:
             return False
@@ -188,7 +229,7 @@ class PermisoAcceso:
             return False
         return True
 
-@dataclass
+@dataclass(slots=True)
 class RegistroAutenticacion:
     id_registro: str
     timestamp: datetime
@@ -202,11 +243,42 @@ class RegistroAutenticacion:
 
     def __post_init__(self) -> None:
         self.id_registro = _require_non_empty(self.id_registro, "ID Registro")
-        self.cedula_propietario = _require_non_empty(self.cedula_propietario, "Cédula Usuario")
+        self.cedula_propietario = _require_key(self.cedula_propietario, "Cédula Usuario")
         validar_cedula(self.cedula_propietario)
-        self.id_area = _require_non_empty(self.id_area, "ID Area")
+        self.id_area = _require_key(self.id_area, "ID Area")
+
+    @classmethod
+    def _unsafe(cls, **kw) -> RegistroAutenticacion:
+        """
+        Construcción interna SIN __post_init__ (no valida). Solo para datos ya validados
+        por quien llama (p.ej. ServicioAuditoria.registrar, con id_registro generado).
+        Las claves se siguen internando.
+        """
+        faltan = _REGISTRO_REQUERIDOS.difference(kw)
+        if faltan:
+            raise TypeError(f"RegistroAutenticacion._unsafe: faltan campos {sorted(faltan)}")
+        r = object.__new__(cls)
+        for name, default, factory in _REGISTRO_DEFAULTS:
+            setattr(r, name, default if factory is MISSING else factory())
+        for k, v in kw.items():
+            setattr(r, k, v)
+        r.cedula_propietario = sys.intern(r.cedula_propietario)
+        r.id_area = sys.intern(r.id_area)
+        return r
+
+# Defaults y campos obligatorios de RegistroAutenticacion, leídos de la propia dataclass
+# (así _unsafe no repite los valores por defecto a mano)
+_REGISTRO_DEFAULTS = tuple(
+    (f.name, f.default, f.default_factory)
+    for f in fields(RegistroAutenticacion)
+    if f.default is not MISSING or f.default_factory is not MISSING
+)
+_REGISTRO_REQUERIDOS = frozenset(
+    f.name for f in fields(RegistroAutenticacion)
+    if f.default is MISSING and f.default_factory is MISSING
+)
 
-@dataclass
+@dataclass(slots=True)
 class Acceso:
     id_acceso: str
     cedula_propietario: str
@@ -217,7 +289,7 @@ class Acceso:
 
     def __post_init__(self) -> None:
         self.id_acceso = _require_non_empty(self.id_acceso, "ID Acceso")
-        self.cedula_propietario = _require_non_empty(self.cedula_propietario, "Cédula Usuario")
+        self.cedula_propietario = _require_key(self.cedula_propietario, "Cédula Usuario")
         validar_cedula(self.cedula_propietario)
-        self.id_area = _require_non_empty(self.id_area, "ID Area")
+        self.id_area = _require_key(self.id_area, "ID Area")
         self.registro_exitoso_id = _require_non_empty(self.registro_exitoso_id, "Registro Exitoso ID")
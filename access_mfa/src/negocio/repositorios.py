@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from types import MappingProxyType
 from dataclasses import dataclass, field
-from datetime import date
-from typing import Dict, List, Optional
+from datetime import date, datetime
+from typing import DefaultDict, Dict, Iterable, List, Optional, Tuple
 
 from .exceptions import RecursoNoEncontradoError, ValidacionError
 from .modelos import (
@@ -35,6 +38,14 @@ class RepoEstudiantes:
     def listar(self) -> List[Estudiante]:
         return list(self._data.values())
 
+    # iterar(): recorrido de solo lectura sin copiar (listar() sigue devolviendo una copia)
+
+    def iterar(self) -> Iterable[Estudiante]:
+        return MappingProxyType(self._data).values()
+
+    def contar(self) -> int:
+        return len(self._data)
+
 @dataclass
 class RepoAreas:
     _data: Dict[str, AreaAcceso] = field(default_factory=dict)
@@ -54,6 +65,12 @@ class RepoAreas:
     def listar(self) -> List[AreaAcceso]:
         return list(self._data.values())
 
+    def iterar(self) -> Iterable[AreaAcceso]:
+        return MappingProxyType(self._data).values()
+
+    def contar(self) -> int:
+        return len(self._data)
+
 
 @dataclass
 class RepoRFID:
@@ -99,6 +116,12 @@ class RepoRFID:
     def listar(self) -> List[CredencialRFID]:
         return list(self._data.values())
 
+    def iterar(self) -> Iterable[CredencialRFID]:
+        return MappingProxyType(self._data).values()
+
+    def contar(self) -> int:
+        return len(self._data)
+
 
 @dataclass
 class RepoPins:
@@ -140,6 +163,12 @@ class RepoPins:
     def listar(self) -> list[PinGestual]:
         return list(self._data.values())
 
+    def iterar(self) -> Iterable[PinGestual]:
+        return MappingProxyType(self._data).values()
+
+    def contar(self) -> int:
+        return len(self._data)
+
 
 @dataclass
 class RepoPatrones:
@@ -177,38 +206,134 @@ class RepoPatrones:
     def listar(self) -> list[PatronGestual]:
         return list(self._data.values())
 
+    def iterar(self) -> Iterable[PatronGestual]:
+        return MappingProxyType(self._data).values()
+
+    def contar(self) -> int:
+        return len(self._data)
+
 
 @dataclass
 class RepoPermisos:
     _data: Dict[str, PermisoAcceso] = field(default_factory=dict)  # id_permiso -> permiso
+    _by_user_area: DefaultDict[Tuple[str, str], List[PermisoAcceso]] = field(default_factory=lambda: defaultdict(list))  # (cedula, id_area) -> permisos
 
     def guardar(self, p: PermisoAcceso) -> None:
+        key = (p.cedula_propietario, p.id_area)
+
+        existente = self._data.get(p.id_permiso)
+        # Un id_permiso ya guardado conserva su posición en _data (orden del escaneo original)
         self._data[p.id_permiso] = p
+        if existente is None:
+            # Nuevo: va al final de _data, y por tanto al final de su bucket
+            self._by_user_area[key].append(p)
+            return
+
+        old_key = (existente.cedula_propietario, existente.id_area)
+        bucket = self._by_user_area.get(old_key, ())
+        i = next((i for i, x in enumerate(bucket) if x is existente), None)
+        if i is None:
+            # `existente` cambió de cédula/área en sitio después de guardarse:
+            # su bucket ya no coincide, se reconstruye todo el índice
+            self._reindexar()
+        elif old_key == key:
+            bucket[i] = p
+        else:
+            del bucket[i]
+            if not bucket:
+                del self._by_user_area[old_key]
+            # Cambió de clave: el bucket destino se rehace en orden de _data, no al final
+            self._by_user_area[key] = [
+                x for x in self._data.values() if x.cedula_propietario == key[0] and x.id_area == key[1]
+            ]
+
+    def _reindexar(self) -> None:
+        idx: DefaultDict[Tuple[str, str], List[PermisoAcceso]] = defaultdict(list)
+        for x in self._data.values():
+            idx[(x.cedula_propietario, x.id_area)].append(x)
+        self._by_user_area = idx
 
     def buscar_permiso(self, cedula: str, id_area: str, hoy: date) -> Optional[PermisoAcceso]:
-        for p in self._data.values():
-            if p.cedula_propietario == cedula and p.id_area == id_area and p.es_vigente(hoy):
+        for p in self._by_user_area.get((cedula, id_area), ()):
+            if p.es_vigente(hoy):
                 return p
         return None
 
     def listar(self) -> List[PermisoAcceso]:
         return list(self._data.values())
 
+    def iterar(self) -> Iterable[PermisoAcceso]:
+        return MappingProxyType(self._data).values()
+
+    def contar(self) -> int:
+        return len(self._data)
+
 @dataclass
 class RepoRegistros:
     _data: List[RegistroAutenticacion] = field(default_factory=list)
+    _by_user: DefaultDict[str, List[RegistroAutenticacion]] = field(default_factory=lambda: defaultdict(list))  # cedula -> registros
+    _by_area: DefaultDict[str, List[RegistroAutenticacion]] = field(default_factory=lambda: defaultdict(list))  # id_area -> registros
+    _timestamps: List[datetime] = field(default_factory=list)  # paralelo a _data
+    _ordenado: bool = True  # False si algún registro llegó con timestamp anterior al último
 
     def agregar(self, r: RegistroAutenticacion) -> None:
+        if self._timestamps and r.timestamp < self._timestamps[-1]:
+            self._ordenado = False
+        self._by_user[r.cedula_propietario].append(r)
+        self._by_area[r.id_area].append(r)
+        self._timestamps.append(r.timestamp)
         self._data.append(r)
 
+    def extend(self, rs: List[RegistroAutenticacion]) -> None:
+        """Carga masiva: una sola pasada por los índices y un extend de _timestamps/_data."""
+        by_user, by_area = self._by_user, self._by_area
+        ts = self._timestamps
+        prev = ts[-1] if ts else None
+        ordenado = self._ordenado
+        nuevos: List[datetime] = []
+        for r in rs:
+            t = r.timestamp
+            if ordenado and prev is not None and t < prev:
+                ordenado = False
+            prev = t
+            by_user[r.cedula_propietario].append(r)
+            by_area[r.id_area].append(r)
+            nuevos.append(t)
+        self._ordenado = ordenado
+        ts.extend(nuevos)
+        self._data.extend(rs)
+
     def listar(self) -> List[RegistroAutenticacion]:
         return list(self._data)
 
+    def iterar(self) -> Iterable[RegistroAutenticacion]:
+        return iter(self._data)
+
     def listar_por_usuario(self, cedula: str) -> List[RegistroAutenticacion]:
-        return [r for r in self._data if r.cedula_propietario == cedula]
+        return list(self._by_user.get(cedula, ()))
 
     def listar_por_area(self, id_area: str) -> List[RegistroAutenticacion]:
-        return [r for r in self._data if r.id_area == id_area]
+        return list(self._by_area.get(id_area, ()))
+
+    def listar_por_rango(self, desde: datetime, hasta: datetime) -> List[RegistroAutenticacion]:
+        """Registros con desde <= timestamp <= hasta (búsqueda binaria si el log está en orden)."""
+        if not self._ordenado:
+            # p.ej. horas forzadas con FORZAR_HORA: el orden de inserción ya no es cronológico
+            return [r for r in self._data if desde <= r.timestamp <= hasta]
+        i = bisect_left(self._timestamps, desde)
+        j = bisect_right(self._timestamps, hasta)
+        return self._data[i:j]
+
+    # Conteos directos desde los índices (sin copiar ni recorrer registros)
+
+    def contar(self) -> int:
+        return len(self._data)
+
+    def contar_por_usuario(self, cedula: str) -> int:
+        return len(self._by_user.get(cedula, ()))
+
+    def contar_por_area(self, id_area: str) -> int:
+        return len(self._by_area.get(id_area, ()))
 
 
 @dataclass
@@ -220,3 +345,9 @@ class RepoAccesos:
 
     def listar(self) -> List[Acceso]:
         return list(self._data)
+
+    def iterar(self) -> Iterable[Acceso]:
+        return iter(self._data)
+
+    def contar(self) -> int:
+        return len(self._data)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import os
+
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Any
 from uuid import uuid4
 
 from .enums import MetodoIngreso, ResultadoAutenticacion
@@ -9,6 +12,16 @@ from .modelos import RegistroAutenticacion
 from .repositorios import RepoRegistros
 
 
+def _uuid4_hex_batch(n: int) -> list[str]:
+    """n UUID4 en hex (mismo formato que uuid4().hex) desde una sola lectura de os.urandom."""
+    raw = bytearray(os.urandom(16 * n))
+    # bits de versión (4) y variante (RFC 4122), igual que UUID(bytes=..., version=4)
+    raw[6::16] = bytes((b & 0x0F) | 0x40 for b in raw[6::16])
+    raw[8::16] = bytes((b & 0x3F) | 0x80 for b in raw[8::16])
+    h = raw.hex()
+    return [h[j:j + 32] for j in range(0, 32 * n, 32)]
+
+
 @dataclass
 class ServicioAuditoria:
     repo_registros: RepoRegistros
@@ -28,8 +41,9 @@ class ServicioAuditoria:
         if timestamp is None:
             timestamp = datetime.now()
 
-        r = RegistroAutenticacion(
-            id_registro=str(uuid4()),
+        # Entradas ya validadas aguas arriba (cédula en la UI, área/permiso en autorización)
+        r = RegistroAutenticacion._unsafe(
+            id_registro=uuid4().hex,
             timestamp=timestamp,
             cedula_propietario=cedula_propietario,
             id_area=id_area,
@@ -41,3 +55,39 @@ class ServicioAuditoria:
         )
         self.repo_registros.agregar(r)
         return r
+
+    def registrar_batch(self, eventos: list[dict[str, Any]]) -> list[RegistroAutenticacion]:
+        """
+        Registra varios eventos de una vez (cada evento: mismos campos keyword que `registrar`).
+        Los IDs salen de una sola lectura de os.urandom, los eventos sin timestamp
+        comparten un único datetime.now() y cada par (cédula, área) se valida una sola vez.
+        Si algún evento es inválido no se agrega ninguno.
+        """
+        n = len(eventos)
+        if n == 0:
+            return []
+
+        ahora = datetime.now()
+        ids = _uuid4_hex_batch(n)
+
+        # Cada par (cédula, área) distinto se valida una vez con el constructor completo;
+        # los demás eventos del par reutilizan sus claves ya validadas/internadas vía _unsafe
+        validados: dict[tuple[str, str], RegistroAutenticacion] = {}
+        registros: list[RegistroAutenticacion] = []
+        for id_registro, ev in zip(ids, eventos):
+            campos = dict(ev)
+            if campos.get("timestamp") is None:
+                campos["timestamp"] = ahora
+            par = (campos.get("cedula_propietario"), campos.get("id_area"))
+            ref = validados.get(par)
+            if ref is None:
+                r = RegistroAutenticacion(id_registro=id_registro, **campos)
+                validados[par] = r
+            else:
+                campos["cedula_propietario"] = ref.cedula_propietario
+                campos["id_area"] = ref.id_area
+                r = RegistroAutenticacion._unsafe(id_registro=id_registro, **campos)
+            registros.append(r)
+
+        self.repo_registros.extend(registros)
+        return registros
@@ -1,24 +1,91 @@
 from __future__ import annotations
 
+import hmac
 import os
 
-from dataclasses import dataclass
 from datetime import datetime
+from typing import final
 
+from .analisis_patrones import similitud_patron
 from .enums import EstadoCredencial, EstadoPin, MetodoIngreso, ResultadoAutenticacion
-from .exceptions import AutenticacionError, ValidacionError, RecursoNoEncontradoError
+from .exceptions import AutenticacionError, RecursoNoEncontradoError, SimilitudPatronError, ValidacionError
+from .modelos import PatronGestual
 from .repositorios import RepoAccesos, RepoPatrones, RepoPins, RepoRFID
 
-@dataclass
+# Configuración de entorno: se lee una vez al importar (reload_env() la vuelve a leer)
+_DEBUG = False
+_TIMING_CHECK = False
+_TIMING_TOL = 0.8
+
+
+def reload_env() -> None:
+    """Relee DEBUG / PATRON_TIMING_CHECK / PATRON_TIMING_TOL del entorno (útil en pruebas)."""
+    global _DEBUG, _TIMING_CHECK, _TIMING_TOL
+    _DEBUG = os.getenv("DEBUG", "0") == "1"
+    # Nota: en webcams reales puede haber variación de tiempos. Para evitar falsos negativos,
+    # el check se DESACTIVA por defecto. Activacion con PATRON_TIMING_CHECK=1
+    _TIMING_CHECK = os.getenv("PATRON_TIMING_CHECK", "0") == "1"
+    _TIMING_TOL = float(os.getenv("PATRON_TIMING_TOL", "0.8"))  # tolerancia relativa
+
+
+reload_env()
+
+# Estados de credencial que rechazan el RFID antes de cualquier otra comprobación
+_RFID_STATE_ERRORS: dict[EstadoCredencial, str] = {
+    EstadoCredencial.BLOQUEADA: "RFID bloqueada.",
+    EstadoCredencial.PERDIDA: "RFID marcada como perdida.",
+    EstadoCredencial.EXPIRADA: "RFID expirada.",
+}
+
+
+def _rangos_timing(patron: PatronGestual) -> tuple[tuple[int, float, float, float], ...]:
+    """
+    (indice, ref, low, high) por cada intervalo de referencia > 0. Se calcula una vez por
+    patrón y tolerancia, y se guarda en el propio patrón (se recalcula si cambia _TIMING_TOL).
+    """
+    cache = patron._rangos_timing
+    if cache is not None and cache[0] == _TIMING_TOL:
+        return cache[1]
+    tol = _TIMING_TOL
+    rangos = tuple(
+        (j, ref, max(0.0, (1.0 - tol) * ref), (1.0 + tol) * ref)
+        for j, ref in enumerate(patron.tiempos_entre_gestos)
+        if ref > 0
+    )
+    patron._rangos_timing = (tol, rangos)
+    return rangos
+
+@final
 class ServicioAutenticacion:
-    repo_rfid: RepoRFID
-    repo_pins: RepoPins
-    repo_patrones: RepoPatrones
-    repo_accesos: RepoAccesos
-
-    max_intentos_rfid: int = 3
-    max_intentos_pin: int = 3
-    umbral_similitud_patron: float = 0.9
+    # Servicio de instancia única: slots y __init__ a mano (sin __dict__ ni __eq__ de dataclass)
+    __slots__ = (
+        "repo_rfid",
+        "repo_pins",
+        "repo_patrones",
+        "repo_accesos",
+        "max_intentos_rfid",
+        "max_intentos_pin",
+        "umbral_similitud_patron",
+    )
+
+    def __init__(
+            self,
+            repo_rfid: RepoRFID,
+            repo_pins: RepoPins,
+            repo_patrones: RepoPatrones,
+            repo_accesos: RepoAccesos,
+            *,
+            max_intentos_rfid: int = 3,
+            max_intentos_pin: int = 3,
+            umbral_similitud_patron: float = 0.9,
+    ) -> None:
+        self.repo_rfid = repo_rfid
+        self.repo_pins = repo_pins
+        self.repo_patrones = repo_patrones
+        self.repo_accesos = repo_accesos
+        self.max_intentos_rfid = max_intentos_rfid
+        self.max_intentos_pin = max_intentos_pin
+        self.umbral_similitud_patron = umbral_similitud_patron
 
     def validar_rfid(self, *, serial: str, cedula_propietario: str, ahora: datetime) -> None:
         try:
@@ -26,14 +93,11 @@ class ServicioAutenticacion:
         except RecursoNoEncontradoError:
             raise AutenticacionError("RFID no registrada en el sistema.")
 
-        # Estado de la credencial
+        # Estado de la credencial (ACTIVA no está en la tabla: un solo dict.get)
 
-        if cred.estado == EstadoCredencial.BLOQUEADA:
-            raise AutenticacionError("RFID bloqueada.")
-        if cred.estado == EstadoCredencial.PERDIDA:
-            raise AutenticacionError("RFID marcada como perdida.")
-        if cred.estado == EstadoCredencial.EXPIRADA:
-            raise AutenticacionError("RFID expirada.")
+        err = _RFID_STATE_ERRORS.get(cred.estado)
+        if err is not None:
+            raise AutenticacionError(err)
 
         if cred.cedula_propietario != cedula_propietario:
             cred.intentos_fallidos += 1
@@ -42,9 +106,10 @@ class ServicioAutenticacion:
                 raise AutenticacionError("RFID bloqueada por demasiados intentos fallidos.")
             raise AutenticacionError("RFID no corresponde al usuario.")
 
-        if not cred.esta_vigente(ahora.date()):
+        hoy = ahora.date()
+        if not cred.esta_vigente(hoy):
             cred.intentos_fallidos += 1
-            if ahora.date() > cred.fecha_expiracion:
+            if hoy > cred.fecha_expiracion:
                 cred.estado = EstadoCredencial.EXPIRADA
             if cred.intentos_fallidos >= self.max_intentos_rfid:
                 cred.estado = EstadoCredencial.BLOQUEADA
@@ -65,7 +130,12 @@ class ServicioAutenticacion:
         if pin.estado == EstadoPin.BLOQUEADO:
             raise AutenticacionError(f"PIN gestual bloqueado para Usuario > {cedula_propietario} en esta Área > {id_area}")
 
-        if secuencia_capturada != pin.secuencia_gestos:
+        try:
+            capturada = bytes(secuencia_capturada)
+        except (TypeError, ValueError):
+            capturada = b""  # valores fuera de 0..255 / no enteros: no pueden coincidir
+        # compare_digest: comparación en C y en tiempo constante (sin salida temprana)
+        if not hmac.compare_digest(capturada, pin._secuencia_bytes):
             pin.intentos_fallidos += 1
             if pin.intentos_fallidos >= self.max_intentos_pin:
                 pin.estado = EstadoPin.BLOQUEADO
@@ -83,37 +153,23 @@ class ServicioAutenticacion:
         if len(secuencia_capturada) == 0:
             raise ValidacionError("La secuencia capturada del patrón está vacía.")
 
-        # Similitud discreta. Si longitudes difieren, se penaliza.
-        n = max(len(patron.secuencia_gestos), len(secuencia_capturada))
-        matches = 0
-        for i in range(min(len(patron.secuencia_gestos), len(secuencia_capturada))):
-            if patron.secuencia_gestos[i] == secuencia_capturada[i]:
-                matches += 1
-        similitud = matches / n
+        # Similitud discreta (misma métrica que las auditorías offline). Si longitudes difieren, se penaliza.
+        similitud = similitud_patron(patron.secuencia_gestos, secuencia_capturada)
 
         if similitud < self.umbral_similitud_patron:
-            raise AutenticacionError(
-                f"Patrón gestual no coincide (similitud={similitud:.2f}, umbral={self.umbral_similitud_patron:.2f})."
-            )
-
-        # Nota: en webcams reales puede haber variación de tiempos. Para evitar falsos negativos,
-        # el check se DESACTIVA por defecto. Activacion con PATRON_TIMING_CHECK=1
-        timing_check = os.getenv("PATRON_TIMING_CHECK", "0") == "1"
-        timing_tol = float(os.getenv("PATRON_TIMING_TOL", "0.8"))  # tolerancia relativa
-        debug = os.getenv("DEBUG", "0") == "1"
+            raise SimilitudPatronError(similitud, self.umbral_similitud_patron)
 
-        if timing_check and patron.tiempos_entre_gestos is not None and tiempos is not None:
+        # Check de timing (desactivado por defecto, ver reload_env): con _TIMING_CHECK en False
+        # todo el bloque se resuelve con una sola prueba booleana
+        if _TIMING_CHECK and patron.tiempos_entre_gestos is not None and tiempos is not None:
             if len(patron.tiempos_entre_gestos) != len(tiempos):
-                if debug:
+                if _DEBUG:
                     print(f"[DEBUG] Patron timing: len_ref={len(patron.tiempos_entre_gestos)} len_got={len(tiempos)} -> omitiendo check")
             else:
-                # tolerancia simple
-                for i, (ref, got) in enumerate(zip(patron.tiempos_entre_gestos, tiempos), start=1):
-                    if ref <= 0:
-                        continue
-                    low = max(0.0, (1.0 - timing_tol) * ref)
-                    high = (1.0 + timing_tol) * ref
+                # tolerancia simple (rangos precalculados por patrón)
+                for j, ref, low, high in _rangos_timing(patron):
+                    got = tiempos[j]
                     if not (low <= got <= high):
-                        if debug:
-                            print(f"[DEBUG] Patron timing fuera: idx={i} ref={ref:.3f}s got={got:.3f}s rango=[{low:.3f},{high:.3f}]")
+                        if _DEBUG:
+                            print(f"[DEBUG] Patron timing fuera: idx={j + 1} ref={ref:.3f}s got={got:.3f}s rango=[{low:.3f},{high:.3f}]")
                         raise AutenticacionError("Patrón gestual: timings fuera de tolerancia.")
@@ -1,21 +1,35 @@
 from __future__ import annotations
 import os
 
-from dataclasses import dataclass
 from datetime import datetime
+from typing import final
 
 from .exceptions import AutorizacionError
 from .repositorios import RepoAreas, RepoPermisos
 
+# Se lee una vez al importar (reload_env() la vuelve a leer)
+_DEBUG = False
 
-@dataclass
+
+def reload_env() -> None:
+    """Relee DEBUG del entorno (útil en pruebas)."""
+    global _DEBUG
+    _DEBUG = os.getenv("DEBUG", "0") == "1"
+
+
+reload_env()
+
+@final
 class ServicioAutorizacion:
-    repo_areas: RepoAreas
-    repo_permisos: RepoPermisos
+    __slots__ = ("repo_areas", "repo_permisos")
+
+    def __init__(self, repo_areas: RepoAreas, repo_permisos: RepoPermisos) -> None:
+        self.repo_areas = repo_areas
+        self.repo_permisos = repo_permisos
 
     def verificar_permiso_y_horario(self, *, cedula_propietario: str, id_area: str, ahora: datetime):
         area = self.repo_areas.obtener(id_area)
-        if os.getenv("DEBUG", "0") == "1":
+        if _DEBUG:
             print(f"[DEBUG] Ahora={ahora.time()} Apertura={area.hora_apertura} Cierre={area.hora_cierre}")
 
         if not area.es_accesible_ahora(ahora):
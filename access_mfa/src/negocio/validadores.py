@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 
 from negocio.exceptions import ValidacionError
 
@@ -13,10 +14,6 @@ _RE_NOMBRE = re.compile(
     r"^[A-Za-zÁÉÍÓÚÜÑáéíóúüñ]+(?:[ '\-][A-Za-zÁÉÍÓÚÜÑáéíóúüñ]+)*$"
 )
 
-_RE_BANNER = re.compile(
-    r"^A\d{8}$"
-)
-
 
 def validar_correo(correo: str) -> str:
     correo = (correo or "").strip()
@@ -24,7 +21,9 @@ def validar_correo(correo: str) -> str:
         raise ValidacionError("Correo institucional es requerido")
     if len(correo) > 254:
         raise ValidacionError("Correo institucional demasiado largo")
-    if _RE_EMAIL.fullmatch(correo) is None:
+    # Descarte rápido (sin regex): falta usuario antes de '@' o dominio sin punto
+    at = correo.find("@")
+    if at < 1 or "." not in correo[at:] or _RE_EMAIL.fullmatch(correo) is None:
         raise ValidacionError("Correo institucional inválido (Formato usuario@dominio)")
     return correo
 
@@ -46,22 +45,28 @@ def validar_id_banner(id_banner: str) -> str:
     id_banner = (id_banner or "").strip().upper()
     if not id_banner:
         raise ValidacionError("ID Banner es requerido")
-    if _RE_BANNER.fullmatch(id_banner) is None:
+    # Formato A######## ('A' + 8 dígitos ASCII; no acepta dígitos Unicode)
+    digitos = id_banner[1:]
+    if len(id_banner) != 9 or id_banner[0] != "A" or not (digitos.isascii() and digitos.isdigit()):
         raise ValidacionError("ID Banner Inválido: Formato esperado A######## (9 caracteres)")
     return id_banner
 
 
-def _cedula_checksum_ok(cedula: str) -> bool:
-    coef = [2, 1, 2, 1, 2, 1, 2, 1, 2]
-    s = 0
-    for d, c in zip(map(int, cedula[:9]), coef):
-        p = d * c
-        if p >= 10:
-            p -= 9
-        s += p
-    mod = s % 10
-    verif = 0 if mod == 0 else 10 - mod
-    return guarantee_int(cedula[9]) == verif
+# Dígito por coeficiente 2 ya reducido (si 2d >= 10, se resta 9), indexado por d
+_LUHN2 = bytes((d * 2 - 9) if d * 2 >= 10 else d * 2 for d in range(10))
+
+# b'0'..b'9' -> 0..9 (un solo bytes.translate convierte los 10 dígitos)
+_ASCII_A_DIGITO = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+
+def _cedula_checksum_ok_digits(d: bytes) -> bool:
+    # d: valores 0..9 ya convertidos; coeficientes 2,1,2,1,... desenrollados
+    s = (
+        _LUHN2[d[0]] + d[1] + _LUHN2[d[2]] + d[3]
+        + _LUHN2[d[4]] + d[5] + _LUHN2[d[6]] + d[7]
+        + _LUHN2[d[8]]
+    )
+    return d[9] == -s % 10
 
 
 def guarantee_int(ch: str) -> int:
@@ -74,21 +79,34 @@ def validar_cedula(cedula: str) -> str:
     if not cedula:
         raise ValidacionError("Cédula es requerida")
 
-    if not cedula.isdigit():
+    # Una sola codificación: el chequeo de dígitos, provincia, tercer dígito y verificador
+    # salen de los mismos bytes. bytes.isdigit solo acepta '0'..'9' (no dígitos Unicode como '²' o '١')
+    try:
+        b = cedula.encode("ascii")
+    except UnicodeEncodeError:
+        raise ValidacionError("Cédula inválida: use solo dígitos (sin letras ni guiones)") from None
+    if not b.isdigit():
         raise ValidacionError("Cédula inválida: use solo dígitos (sin letras ni guiones)")
 
-    if len(cedula) != 10:
+    if len(b) != 10:
         raise ValidacionError("Cédula inválida: debe tener exactamente 10 dígitos")
 
-    provincia = int(cedula[:2])
+    # Dígitos convertidos una sola vez; provincia, tercer dígito y verificador los reutilizan
+    d = b.translate(_ASCII_A_DIGITO)
+
+    provincia = d[0] * 10 + d[1]
     if provincia < 1 or provincia > 24:
         raise ValidacionError("Cédula inválida: Código de Provincia NO válido")
 
-    tercer = int(cedula[2])
-    if tercer < 0 or tercer > 5:
+    if d[2] > 5:
         raise ValidacionError("Cédula inválida: Tercer dígito NO corresponde a Persona Natural")
 
-    if not _cedula_checksum_ok(cedula):
+    if not _cedula_checksum_ok_digits(d):
         raise ValidacionError("Cédula inválida: Dígito verificador NO coincide")
 
     return cedula
+
+
+# Versión memoizada para la GUI (mismo usuario reintentando acceso).
+# Solo se cachean cédulas válidas: las inválidas lanzan ValidacionError.
+validar_cedula_cached = lru_cache(maxsize=256)(validar_cedula)
@@ -4,9 +4,12 @@ import serial
 PORT = "COM5"      # <-- cambia esto
 BAUD = 9600        # <-- cambia si tu ino usa otro baud
 
+_BUF = bytearray(5)  # buffer reutilizado entre envíos
+
 def enviar(dedos):
     # dedos debe ser lista de 5 ints 0/1
-    ser.write(bytes(dedos))
+    _BUF[:] = dedos
+    ser.write(_BUF)
 
 if __name__ == "__main__":
     ser = serial.Serial(PORT, BAUD, timeout=1)
@@ -5,16 +5,20 @@ import serial
 PORT = os.getenv("ARDUINO_PORT", "COM5")
 BAUD = int(os.getenv("ARDUINO_BAUD", "9600"))
 
+buf = bytearray(5)  # mismo buffer para ambos envíos
+
 ser = serial.Serial(PORT, BAUD, timeout=1)
 time.sleep(2)
 
 print("OK: puerto abierto", PORT)
 
-ser.write(bytes([1,1,1,1,1]))
+buf[:] = (1, 1, 1, 1, 1)
+ser.write(buf)
 ser.flush()
 time.sleep(1)
 
-ser.write(bytes([0,0,0,0,0]))
+buf[:] = (0, 0, 0, 0, 0)
+ser.write(buf)
 ser.flush()
 
 ser.close()